@@ -1,9 +1,11 @@
-import statistics
+import time
+import array
+import numpy as np
 from typing import Optional
 from collections import namedtuple
 from agentos.run import Run
 from mlflow.utils.mlflow_tags import MLFLOW_PARENT_RUN_ID, MLFLOW_RUN_NAME
-from mlflow.entities import RunStatus
+from mlflow.entities import Metric, Param, RunStatus, RunTag
 
 _EPISODE_KEY = "episode_count"
 _STEP_KEY = "step_count"
@@ -79,25 +81,34 @@ class AgentRun(Run):
         """
         super().__init__()
         self.parent_run = parent_run
-        self.set_tag(self.IS_AGENT_RUN_TAG, "True")
-        self.episode_data = []
+        # Per-episode step counts and rewards, stored as two typed arrays
+        # rather than a dict per episode.
+        self._episode_steps = array.array("q")
+        self._episode_rewards = array.array("d")
         self.run_type = run_type
         self.agent_name = agent_name or "agent"
         self.environment_name = environment_name or "environment"
 
-        self.set_tag(
-            MLFLOW_RUN_NAME,
-            (
-                f"AgentOS {run_type} with Agent '{self.agent_name}' "
-                f"and Env '{self.environment_name}'"
-            ),
+        run_name = (
+            f"AgentOS {run_type} with Agent '{self.agent_name}' "
+            f"and Env '{self.environment_name}'"
         )
+        tags = [
+            RunTag(self.IS_AGENT_RUN_TAG, "True"),
+            RunTag(MLFLOW_RUN_NAME, run_name),
+            RunTag(self.RUN_TYPE_TAG, self.run_type),
+        ]
         if self.parent_run:
-            self.set_tag(MLFLOW_PARENT_RUN_ID, self.parent_run.info.run_id)
-
-        self.log_run_type(self.run_type)
-        self.log_agent_name(self.agent_name)
-        self.log_environment_name(self.environment_name)
+            tags.append(
+                RunTag(MLFLOW_PARENT_RUN_ID, self.parent_run.info.run_id)
+            )
+        params = [
+            Param(self.AGENT_NAME_KEY, self.agent_name),
+            Param(self.ENV_NAME_KEY, self.environment_name),
+        ]
+        # Record the initial tags and params in one request instead of one
+        # set_tag()/log_param() request each.
+        self.log_batch(params=params, tags=tags)
 
     def log_run_type(self, run_type: str) -> None:
         self.run_type = run_type
@@ -109,25 +120,44 @@ class AgentRun(Run):
     def log_environment_name(self, environment_name: str) -> None:
         self.log_param(self.ENV_NAME_KEY, environment_name)
 
+    @property
+    def episode_data(self) -> list:
+        return [
+            {"steps": steps, "reward": reward}
+            for steps, reward in zip(
+                self._episode_steps, self._episode_rewards
+            )
+        ]
+
     def log_run_metrics(self):
-        assert self.episode_data, "No episode data!"
+        assert self._episode_rewards, "No episode data!"
         run_stats = self._get_run_stats()
-        for key in _RUN_STATS_MEMBERS:
-            val = getattr(run_stats, key)
-            self.log_metric(key, val)
+        # Log all the stats in a single request rather than one per metric.
+        timestamp = int(time.time() * 1000)
+        metrics = [
+            Metric(key, getattr(run_stats, key), timestamp, 0)
+            for key in _RUN_STATS_MEMBERS
+        ]
+        self.log_batch(metrics=metrics)
 
     def get_training_info(self) -> (int, int):
-        runs = self.get_all_runs()
+        # Let the tracking store select the learn runs rather than fetching
+        # every run and filtering them here. Search this run's own store,
+        # the one log_run_metrics() writes to.
+        learn_runs = self._search_all_mlflow_runs(
+            filter_string=f"tag.{self.RUN_TYPE_TAG} = '{self.LEARN_KEY}'",
+            client=self._mlflow_client,
+        )
         total_episodes = 0
         total_steps = 0
-        for run in runs:
-            if run.data.tags.get(self.RUN_TYPE_TAG) == self.LEARN_KEY:
-                total_episodes += int(run.data.metrics.get(_EPISODE_KEY, 0))
-                total_steps += int(run.data.metrics.get(_STEP_KEY, 0))
+        for mlflow_run in learn_runs:
+            metrics = mlflow_run.data.metrics
+            total_episodes += int(metrics.get(_EPISODE_KEY, 0))
+            total_steps += int(metrics.get(_STEP_KEY, 0))
         return total_episodes, total_steps
 
     def print_results(self):
-        if not self.episode_data:
+        if not self._episode_rewards:
             return
         run_stats = self._get_run_stats()
         if self.run_type == self.LEARN_KEY:
@@ -169,27 +199,23 @@ class AgentRun(Run):
         print()
 
     def _get_run_stats(self):
-        episode_lengths = [d["steps"] for d in self.episode_data]
-        episode_returns = [d["reward"] for d in self.episode_data]
+        episode_count = len(self._episode_rewards)
+        episode_returns = np.array(self._episode_rewards, dtype=np.float64)
         training_episodes, training_steps = self.get_training_info()
         return RunStats(
-            episode_count=len(self.episode_data),
-            step_count=sum(episode_lengths),
-            max_reward=max(episode_returns),
-            mean_reward=statistics.mean(episode_returns),
-            median_reward=statistics.median(episode_returns),
-            min_reward=min(episode_returns),
+            episode_count=episode_count,
+            step_count=sum(self._episode_steps),
+            max_reward=float(episode_returns.max()),
+            mean_reward=float(episode_returns.mean()),
+            median_reward=float(np.median(episode_returns)),
+            min_reward=float(episode_returns.min()),
             training_episode_count=training_episodes,
             training_step_count=training_steps,
         )
 
     def add_episode_data(self, steps: int, reward: float):
-        self.episode_data.append(
-            {
-                "steps": steps,
-                "reward": reward,
-            }
-        )
+        self._episode_steps.append(steps)
+        self._episode_rewards.append(reward)
 
     def end(
         self,
@@ -12,6 +12,7 @@ from agentos import Component
 from agentos import ParameterSet
 from agentos.run import Run
 from agentos.registry import Registry
+from agentos.utils import SafeYamlDumper
 
 
 @click.group()
@@ -173,10 +174,11 @@ def status(entity_id, registry_file):
     ENTITY_ID can be a Component name or a Run ID.
     """
     print(f"entity_id is {entity_id}")
+    run = Run.get_by_id(entity_id) if entity_id else None
     if not entity_id:
         Run.print_all_status()
-    elif Run.run_exists(entity_id):
-        Run.from_existing_run_id(entity_id).print_status(detailed=True)
+    elif run:
+        run.print_status(detailed=True)
     else:  # assume entity_id is a ComponentIdentifier
         try:
             component = Component.from_registry_file(registry_file, entity_id)
@@ -217,7 +219,7 @@ def freeze(component_name, registry_file, force):
     """
     component = Component.from_registry_file(registry_file, component_name)
     frozen_reg = component.to_frozen_registry(force=force)
-    print(yaml.dump(frozen_reg.to_dict()))
+    print(yaml.dump(frozen_reg.to_dict(), Dumper=SafeYamlDumper))
 
 
 @agentos_cmd.command()
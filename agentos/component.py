@@ -1,11 +1,10 @@
 import sys
 import uuid
 import importlib
+from contextvars import ContextVar
 from pathlib import Path
-from dill.source import getsource as dill_getsource
-from typing import Union, TypeVar, Dict, Type, Any, Sequence
-from rich import print as rich_print
-from rich.tree import Tree
+from typing import Union, TypeVar, Dict, Type, Any, Sequence, Optional
+from typing import TYPE_CHECKING
 from agentos.run import Run
 from agentos.run_command import RunCommand
 from agentos.component_run import ComponentRun
@@ -19,9 +18,18 @@ from agentos.exceptions import RegistryException
 from agentos.repo import Repo, LocalRepo, GitHubRepo
 from agentos.parameter_set import ParameterSet
 
+if TYPE_CHECKING:
+    from rich.tree import Tree
+
 # Use Python generics (https://mypy.readthedocs.io/en/stable/generics.html)
 T = TypeVar("T")
 
+# Maps id(component) to the ComponentRun currently active for it. Held in a
+# ContextVar (and only ever replaced, never mutated) so that concurrent
+# threads or asyncio tasks running the same Components each see their own
+# active runs instead of clobbering a shared attribute.
+_active_runs: ContextVar = ContextVar("_active_runs", default={})
+
 
 class Component:
     """
@@ -69,7 +77,19 @@ class Component:
         self.dependencies = dependencies if dependencies else {}
         self._dunder_name = dunder_name or "__component__"
         self._requirements = []
-        self.active_run = None
+
+    @property
+    def active_run(self) -> Optional[ComponentRun]:
+        return _active_runs.get().get(id(self))
+
+    @active_run.setter
+    def active_run(self, run: Optional[ComponentRun]) -> None:
+        runs = dict(_active_runs.get())
+        if run:
+            runs[id(self)] = run
+        else:
+            runs.pop(id(self), None)
+        _active_runs.set(runs)
 
     @classmethod
     def from_default_registry(
@@ -152,6 +172,9 @@ class Component:
                 f"Trying to create a source file from class {name} at"
                 f"{src_file} but that file already exists."
             )
+            # dill is slow to import and only needed for REPL classes.
+            from dill.source import getsource as dill_getsource
+
             with open(src_file, "x") as f:
                 f.write(dill_getsource(managed_cls))
             print(f"Wrote new source file {src_file}.")
@@ -266,18 +289,20 @@ class Component:
             params = ParameterSet()
         run_command = RunCommand(self, entry_point, params)
         with ComponentRun.from_run_command(run_command) as run:
-            for c in self.dependency_list():
-                c.active_run = run
-            # Note: get_object() adds the dunder component attribute before
-            # calling __init__ on the instance.
-            instance = self.get_object(params=params)
-            res = self.call_function_with_param_set(
-                instance, entry_point, params
-            )
-            if log_return_value:
-                run.log_return_value(res, return_value_log_format)
-            for c in self.dependency_list():
-                c.active_run = None
+            runs = dict(_active_runs.get())
+            runs.update({id(c): run for c in self.dependency_list()})
+            token = _active_runs.set(runs)
+            try:
+                # Note: get_object() adds the dunder component attribute
+                # before calling __init__ on the instance.
+                instance = self.get_object(params=params)
+                res = self.call_function_with_param_set(
+                    instance, entry_point, params
+                )
+                if log_return_value:
+                    run.log_return_value(res, return_value_log_format)
+            finally:
+                _active_runs.reset(token)
             if publish_to:
                 run.to_registry(publish_to)
             return run
@@ -411,20 +436,24 @@ class Component:
         if not registry:
             registry = InMemoryRegistry()
         for c in self.dependency_list():
+            c_spec = c.to_spec()
             existing_c_spec = registry.get_component_specs(
                 filter_by_name=c.name, filter_by_version=c.version
             )
             if existing_c_spec and not force:
-                if existing_c_spec != c.to_spec():
+                if existing_c_spec != c_spec:
                     raise RegistryException(
                         f"Trying to register a component {c.identifier} that "
                         f"already exists in a different form:\n"
                         f"{existing_c_spec}\n"
                         f"VS\n"
-                        f"{c.to_spec()}\n\n"
+                        f"{c_spec}\n\n"
                         f"To overwrite, specify force=true."
                     )
-            registry.add_component_spec(c.to_spec())
+            # Components shared by several runs (or several dependents)
+            # are often registered already; skip re-adding identical specs.
+            if existing_c_spec != c_spec:
+                registry.add_component_spec(c_spec)
             try:
                 repo_spec = registry.get_repo_spec(c.repo.identifier)
                 if repo_spec != c.repo.to_spec():
@@ -468,10 +497,14 @@ class Component:
         return list(ret_val)
 
     def print_status_tree(self) -> None:
+        from rich import print as rich_print
+
         tree = self.get_status_tree()
         rich_print(tree)
 
-    def get_status_tree(self, parent_tree: Tree = None) -> Tree:
+    def get_status_tree(self, parent_tree: "Tree" = None) -> "Tree":
+        from rich.tree import Tree
+
         self_tree = Tree(f"Component: {self.identifier.full}")
         if parent_tree is not None:
             parent_tree.add(self_tree)
@@ -1,12 +1,16 @@
-import tempfile
+import json
+import pickle
+import yaml
+from mlflow.entities import RunTag
 from mlflow.utils.mlflow_tags import MLFLOW_RUN_NAME
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, Sequence
 from agentos.exceptions import PythonComponentSystemException
 from agentos.registry import Registry
 from agentos.run import Run
 from agentos.run_command import RunCommand
-from agentos.specs import RunSpec
+from agentos.specs import RunSpec, RunSpecKeys
+from agentos.utils import YamlDumper
 
 
 def active_component_run(
@@ -49,11 +53,30 @@ def active_component_run(
         return component.active_run
 
 
+def _dump_pickle(value: Any, f) -> None:
+    # Protocol 5 (Python 3.8+) pickles large buffers such as NumPy arrays
+    # without extra copies; 3.7 gets protocol 4.
+    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _dump_yaml(value: Any, f) -> None:
+    yaml.dump(value, f, Dumper=YamlDumper)
+
+
 class ComponentRun(Run):
     IS_FROZEN_KEY = "agentos.spec_is_frozen"
     IS_COMPONENT_RUN_TAG = "pcs.is_component_run"
     RUN_COMMAND_ID_KEY = "agentos.run_command_id"
-    RUN_COMMAND_REGISTRY_FILENAME = "agentos.run_command_registry.yaml"
+    RUN_COMMAND_REGISTRY_FILENAME = "agentos.run_command_registry.json"
+    # Runs logged by earlier versions stored the registry as YAML.
+    LEGACY_RUN_COMMAND_REGISTRY_FILENAME = "agentos.run_command_registry.yaml"
+    # Maps each supported return value format to the file mode, file
+    # suffix, and dump function used to serialize it.
+    RETURN_VALUE_FORMATS = {
+        "pickle": ("wb", ".pickle", _dump_pickle),
+        "json": ("w", ".json", json.dump),
+        "yaml": ("w", ".yaml", _dump_yaml),
+    }
     """
     A ComponentRun represents the execution of a specific entry point of a
     specific Component with a specific parameter set.
@@ -79,12 +102,26 @@ class ComponentRun(Run):
             self.set_and_log_run_command(run_command)
         else:
             self._run_command = self._fetch_run_command()
-        self.set_tag(self.IS_COMPONENT_RUN_TAG, "True")
-        self.set_tag(
-            MLFLOW_RUN_NAME,
+            # An existing component run normally carries these tags already,
+            # so only write the ones that are missing.
+            existing_tags = self._mlflow_run.data.tags
+            missing_tags = [
+                tag
+                for tag in self._get_component_run_tags()
+                if existing_tags.get(tag.key) != tag.value
+            ]
+            if missing_tags:
+                self.log_batch(tags=missing_tags)
+
+    def _get_component_run_tags(self) -> Sequence[RunTag]:
+        run_name = (
             f"PCS Component '{self.run_command.component.identifier.full}' "
-            f"at Entry Point '{self.run_command.entry_point}'",
+            f"at Entry Point '{self.run_command.entry_point}'"
         )
+        return [
+            RunTag(self.IS_COMPONENT_RUN_TAG, "True"),
+            RunTag(MLFLOW_RUN_NAME, run_name),
+        ]
 
     @property
     def run_command(self) -> "RunCommand":
@@ -120,22 +157,31 @@ class ComponentRun(Run):
     def _fetch_run_command(self) -> RunCommand:
         try:
             path = self.download_artifacts(self.RUN_COMMAND_REGISTRY_FILENAME)
-        except IOError as e:
-            raise IOError(
-                f"RunCommand registry artifact not found in Run with id "
-                f"{self._mlflow_run_id}. {repr(e)}"
-            )
-        assert self.RUN_COMMAND_ID_KEY in self._mlflow_run.data.tags, (
+        except IOError:
+            try:
+                path = self.download_artifacts(
+                    self.LEGACY_RUN_COMMAND_REGISTRY_FILENAME
+                )
+            except IOError as e:
+                raise IOError(
+                    f"RunCommand registry artifact not found in Run with id "
+                    f"{self._mlflow_run_id}. {repr(e)}"
+                )
+        tags = self._mlflow_run.data.tags
+        assert self.RUN_COMMAND_ID_KEY in tags, (
             f"{self.RUN_COMMAND_ID_KEY} not found in the tags of MLflow "
             f"run with id {self._mlflow_run_id}."
         )
-        run_command_id = self._mlflow_run.data.tags[self.RUN_COMMAND_ID_KEY]
-        registry = Registry.from_yaml(path)
+        run_command_id = tags[self.RUN_COMMAND_ID_KEY]
+        if Path(path).suffix == ".json":
+            registry = Registry.from_json(path)
+        else:
+            registry = Registry.from_yaml(path)
         return RunCommand.from_registry(registry, run_command_id)
 
     def set_and_log_run_command(self, run_command: RunCommand) -> None:
         """
-        Log a Registry YAML file for the RunCommand of this run, including
+        Log a Registry JSON file for the RunCommand of this run, including
         the ParameterSet, entry_point (i.e., function name), component ID,
         as well as the root component being run and its full
         transitive dependency graph of other components as part of this Run.
@@ -148,13 +194,24 @@ class ComponentRun(Run):
         component's full dependency graph) can be dumped into a Registry for
         sharing purposes, which essentially normalizes the Run's root
         component's dependency graph into flat component specs.
+
+        The RunCommand's identifier is recorded as a tag, in the same
+        request as the tags that mark this as a component run.
         """
         assert not self._run_command
         self._run_command = run_command
         self._validate_no_run_command_logged()
-        self.set_tag(self.RUN_COMMAND_ID_KEY, run_command.identifier)
+        run_command_tag = RunTag(
+            self.RUN_COMMAND_ID_KEY, run_command.identifier
+        )
+        self.log_batch(tags=[run_command_tag] + self._get_component_run_tags())
         run_command_dict = run_command.to_registry().to_dict()
-        self.log_dict(run_command_dict, self.RUN_COMMAND_REGISTRY_FILENAME)
+        # Stage the registry file ourselves (in the same format log_dict()
+        # would write) so that it can be uploaded in the background.
+        path = self._get_tmp_dir() / self.RUN_COMMAND_REGISTRY_FILENAME
+        with open(path, "w") as f:
+            json.dump(run_command_dict, f, indent=2)
+        self.log_artifact_async(str(path), cleanup=path.unlink)
 
     def _validate_no_run_command_logged(self):
         assert self.RUN_COMMAND_ID_KEY not in self._mlflow_run.data.tags, (
@@ -163,12 +220,15 @@ class ComponentRun(Run):
             "once per a Run."
         )
         artifact_paths = [a.path for a in self.list_artifacts()]
-        assert self.RUN_COMMAND_REGISTRY_FILENAME not in artifact_paths, (
-            f"An artifact with name {self.RUN_COMMAND_REGISTRY_FILENAME} "
-            "has already been logged to the MLflow run with id "
-            f"{self._mlflow_run_id}. A run_command can only be logged "
-            "once per a Run."
-        )
+        for filename in [
+            self.RUN_COMMAND_REGISTRY_FILENAME,
+            self.LEGACY_RUN_COMMAND_REGISTRY_FILENAME,
+        ]:
+            assert filename not in artifact_paths, (
+                f"An artifact with name {filename} has already been logged "
+                f"to the MLflow run with id {self._mlflow_run_id}. A "
+                "run_command can only be logged once per a Run."
+            )
 
     def log_return_value(
         self,
@@ -186,45 +246,29 @@ class ComponentRun(Run):
             not self._return_value
         ), "return_value has already been logged and can only be logged once."
         self._return_value = ret_val
-        tmp_dir_path = Path(tempfile.mkdtemp())
-        filename_base = tmp_dir_path / (self.identifier + "-return_value")
-        if format == "pickle":
-            import pickle
-
-            filename = filename_base.parent / (filename_base.name + ".pickle")
-            with open(filename, "wb") as f:
-                pickle.dump(ret_val, f)
-        elif format == "json":
-            import json
-
-            filename = filename_base.parent / (filename_base.name + ".json")
-            with open(filename, "w") as f:
-                json.dump(ret_val, f)
-        elif format == "yaml":
-            import yaml
-
-            filename = filename_base.parent / (filename_base.name + ".yaml")
-            with open(filename, "w") as f:
-                yaml.dump(ret_val, f)
-        else:
+        try:
+            mode, suffix, dump = self.RETURN_VALUE_FORMATS[format]
+        except KeyError:
             raise PythonComponentSystemException("Invalid format provided")
-        self.log_artifact(str(filename))
-        filename.unlink()
+        filename = self._get_tmp_dir() / (
+            f"{self.identifier}-return_value{suffix}"
+        )
+        with open(filename, mode) as f:
+            dump(ret_val, f)
+        self.log_artifact_async(str(filename), cleanup=filename.unlink)
 
     @property
     def is_publishable(self) -> bool:
         # use like: filtered_tags["is_publishable"] = self.is_publishable
-        try:
-            return self._mlflow_run.data.tags[self.IS_FROZEN_KEY] == "True"
-        except KeyError:
-            return False
+        tags = self._mlflow_run.data.tags
+        return tags.get(self.IS_FROZEN_KEY) == "True"
 
     def to_spec(self, flatten: bool = False) -> RunSpec:
         inner_spec = super().to_spec()
         run_cmd = self.run_command.to_spec() if self.run_command else None
         inner_spec["run_command"] = run_cmd
         if flatten:
-            inner_spec.update({RunSpec.identifier_key: self.identifier})
+            inner_spec.update({RunSpecKeys.IDENTIFIER: self.identifier})
             return inner_spec
         else:
             return {self.identifier: inner_spec}
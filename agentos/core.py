@@ -180,14 +180,18 @@ class Agent(MemberInitializer):
         done = False
         step_count = 0
         reward = 0
+        # Look these up once rather than on every step of the episode.
+        advance = self.advance
+        improve = self.trainer.improve if should_learn else None
+        dataset, policy = self.dataset, self.policy
         while not done:
             if max_transitions and step_count > max_transitions:
                 break
-            _, _, _, tmp_reward, done, _ = self.advance()
+            _, _, _, tmp_reward, done, _ = advance()
             reward += tmp_reward
             step_count += 1
-            if should_learn:
-                self.trainer.improve(self.dataset, self.policy)
+            if improve:
+                improve(dataset, policy)
         self.active_agent_run.add_episode_data(steps=step_count, reward=reward)
         if should_learn:
             self.trainer.improve(self.dataset, self.policy)
@@ -1,9 +1,11 @@
+import os
 import copy
 import yaml
 import json
 from hashlib import sha1
 from typing import TypeVar, Mapping, Dict
-from agentos.specs import ParameterSetSpec
+from agentos.specs import ParameterSetSpec, ParameterSetSpecKeys
+from agentos.utils import SafeYamlLoader
 
 # Use Python generics (https://mypy.readthedocs.io/en/stable/generics.html)
 T = TypeVar("T")
@@ -50,9 +52,11 @@ class ParameterSet:
     @classmethod
     def from_yaml(cls, file_path) -> "ParameterSet":
         parameters = {}
-        if file_path is not None:
+        # An empty parameter file holds no parameters, so skip opening and
+        # parsing it.
+        if file_path is not None and os.path.getsize(file_path) > 0:
             with open(file_path) as file_in:
-                parameters = yaml.safe_load(file_in)
+                parameters = yaml.load(file_in, Loader=SafeYamlLoader)
         return ParameterSet(parameters=parameters)
 
     @classmethod
@@ -100,7 +104,7 @@ class ParameterSet:
     def to_spec(self, flatten: bool = False) -> ParameterSetSpec:
         inner = copy.deepcopy(self._parameters)
         if flatten:
-            inner.update({ParameterSetSpec.identifier_key: self.identifier})
+            inner.update({ParameterSetSpecKeys.IDENTIFIER: self.identifier})
             return inner
         else:
             return {str(self.identifier): inner}
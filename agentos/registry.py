@@ -3,10 +3,10 @@ import os
 import yaml
 import json
 import pprint
-import shutil
-import tarfile
 import tempfile
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 from typing import Dict, Sequence, Union, TYPE_CHECKING
 from dotenv import load_dotenv
@@ -16,6 +16,7 @@ from agentos.identifiers import (
     RepoIdentifier,
     RunCommandIdentifier,
 )
+from agentos.utils import SafeYamlLoader, SafeYamlDumper
 from agentos.specs import (
     flatten_spec,
     RepoSpec,
@@ -53,9 +54,15 @@ class Registry(abc.ABC):
     @staticmethod
     def from_yaml(yaml_file: str) -> "Registry":
         with open(yaml_file) as file_in:
-            config = yaml.safe_load(file_in)
+            config = yaml.load(file_in, Loader=SafeYamlLoader)
         return InMemoryRegistry(config, base_dir=str(Path(yaml_file).parent))
 
+    @staticmethod
+    def from_json(json_file: str) -> "Registry":
+        with open(json_file) as file_in:
+            config = json.load(file_in)
+        return InMemoryRegistry(config, base_dir=str(Path(json_file).parent))
+
     @classmethod
     def from_default(cls):
         if not hasattr(cls, "_default_registry"):
@@ -67,8 +74,17 @@ class Registry(abc.ABC):
         raise NotImplementedError
 
     def to_yaml(self, filename: str) -> None:
-        with open(filename, "w") as file:
-            yaml.dump(self.to_dict(), file)
+        # Write next to the target and then atomically move the file into
+        # place so a failure part way through never leaves a truncated
+        # registry file behind.
+        tmp_path = Path(f"{filename}.tmp")
+        try:
+            with open(tmp_path, "w") as file:
+                yaml.dump(self.to_dict(), file, Dumper=SafeYamlDumper)
+            os.replace(tmp_path, filename)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
 
     @abc.abstractmethod
     def get_component_specs(
@@ -328,6 +344,24 @@ class WebRegistry(Registry):
         self.base_dir = (
             base_dir if base_dir else "."
         )  # Used for file-backed Registry types.
+        # Reuse one keep-alive connection pool for all requests to the
+        # registry server instead of opening a new connection per request.
+        self._session = requests.Session()
+        # Idempotent requests are retried with backoff when the server is
+        # briefly unavailable (e.g. while a web dyno is restarting).
+        # If retries run out, the last response is returned as usual so
+        # that _check_response() reports the error.
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[502, 503, 504],
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=4, pool_maxsize=8, max_retries=retry
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
 
     @staticmethod
     def _check_response(response):
@@ -353,7 +387,7 @@ class WebRegistry(Registry):
             url_filter_str = f"?{url_filter_str}"
         component_url = f"{self.root_api_url}/components{url_filter_str}"
         print(f"trying {component_url}")
-        component_response = requests.get(component_url)
+        component_response = self._session.get(component_url)
         assert component_response.status_code == 200
         json_results = json.loads(component_response.content)
         component_specs = {}
@@ -376,7 +410,7 @@ class WebRegistry(Registry):
     ) -> "RepoSpec":
         repo_url = f"{self.root_api_url}/repos?identifier={repo_id}"
         print(f"trying {repo_url}")
-        repo_response = requests.get(repo_url)
+        repo_response = self._session.get(repo_url)
         assert repo_response.status_code == 200
         json_results = json.loads(repo_response.content)
         assert len(json_results["results"]) <= 1, (
@@ -415,7 +449,7 @@ class WebRegistry(Registry):
     ):
         assert spec_type in ["run", "run_command", "repo", "component"]
         req_url = f"{self.root_api_url}/{spec_type}s/{identifier}"
-        run_response = requests.get(req_url)
+        run_response = self._session.get(req_url)
         spec = json.loads(run_response.content)
         return flatten_spec(spec) if flatten else spec
 
@@ -426,7 +460,7 @@ class WebRegistry(Registry):
         url = f"{self.root_api_url}/repos/"
         print("Sending HTTP POST with data:")
         print(flatten_spec(repo_spec))
-        response = requests.post(url, data=flatten_spec(repo_spec))
+        response = self._session.post(url, data=flatten_spec(repo_spec))
         self._check_response(response)
         result = json.loads(response.content)
         print("\nadd_repo_spec http response results:")
@@ -442,7 +476,7 @@ class WebRegistry(Registry):
         :param component_spec: A frozen component spec.
         """
         url = f"{self.root_api_url}/components/"
-        response = requests.post(url, data=flatten_spec(component_spec))
+        response = self._session.post(url, data=flatten_spec(component_spec))
         self._check_response(response)
         result = json.loads(response.content)
         print("\nadd_component_spec http response results:")
@@ -450,8 +484,8 @@ class WebRegistry(Registry):
 
     def add_run_spec(self, run_data: RunSpec) -> Sequence:
         url = f"{self.root_api_url}/runs/"
-        data = {"run_data": yaml.dump(run_data)}
-        response = requests.post(url, data=data)
+        data = {"run_data": yaml.dump(run_data, Dumper=SafeYamlDumper)}
+        response = self._session.post(url, data=data)
         self._check_response(response)
         result = json.loads(response.content)
         print("\nadd_run_spec http response results:")
@@ -460,19 +494,22 @@ class WebRegistry(Registry):
     def add_run_artifacts(
         self, run_id: int, run_artifact_paths: Sequence[str]
     ) -> Sequence:
-        try:
-            tmp_dir_path = Path(tempfile.mkdtemp())
-            tar_gz_path = tmp_dir_path / f"run_{run_id}_artifacts.tar.gz"
-            with tarfile.open(tar_gz_path, "w:gz") as tar:
+        import tarfile
+
+        # Stream the archive into an anonymous temporary file instead of
+        # a temporary directory: it is removed as soon as it is closed, so
+        # there is no directory to create or tear down around the upload.
+        tarball_name = f"run_{run_id}_artifacts.tar.gz"
+        with tempfile.TemporaryFile() as tarball:
+            with tarfile.open(fileobj=tarball, mode="w:gz") as tar:
                 for artifact_path in run_artifact_paths:
                     tar.add(artifact_path, arcname=artifact_path.name)
-            files = {"tarball": open(tar_gz_path, "rb")}
+            tarball.seek(0)
+            files = {"tarball": (tarball_name, tarball)}
             url = f"{self.root_api_url}/runs/{run_id}/upload_artifact/"
-            response = requests.post(url, files=files)
-            result = json.loads(response.content)
-            return result
-        finally:
-            shutil.rmtree(tmp_dir_path)
+            response = self._session.post(url, files=files)
+        result = json.loads(response.content)
+        return result
 
     def add_run_command_spec(self, run_command_spec: RunCommandSpec) -> None:
         """
@@ -480,7 +517,7 @@ class WebRegistry(Registry):
         :param run_command_spec: A :py:func:agentos.specs.RunCommandSpec``.
         """
         url = f"{self.root_api_url}/run_commands/"
-        response = requests.post(url, data=flatten_spec(run_command_spec))
+        response = self._session.post(url, data=flatten_spec(run_command_spec))
         self._check_response(response)
         result = json.loads(response.content)
         print("\nadd_run_commmand_spec http response results:")
@@ -1,17 +1,73 @@
+import os
+import time
+import atexit
 import pprint
+import random
+import tempfile
+from concurrent import futures
 from functools import partial
 from pathlib import Path
-from typing import Sequence
+from typing import Callable, Optional, Sequence
 from urllib.parse import urlparse
+from urllib.request import url2pathname
 from mlflow.entities import RunStatus
 from mlflow.exceptions import MlflowException
-from mlflow.tracking import MlflowClient
+from mlflow.tracking import MlflowClient, get_tracking_uri
 from mlflow.tracking.context import registry as context_registry
 from agentos.identifiers import RunIdentifier
-from agentos.registry import Registry
+from agentos.registry import Registry, InMemoryRegistry
 from agentos.specs import RunSpec
 
 
+# MLflow error codes that can be raised transiently when many runs are
+# created concurrently against the same tracking store.
+_RETRYABLE_MLFLOW_ERROR_CODES = (
+    "RESOURCE_ALREADY_EXISTS",
+    "TEMPORARILY_UNAVAILABLE",
+)
+
+
+def _retry_mlflow_call(
+    fn: Callable, *args, retries: int = 5, base_delay: float = 0.1, **kwargs
+):
+    """
+    Calls ``fn(*args, **kwargs)``, retrying with jittered exponential backoff
+    if it raises an MlflowException with a retryable error code.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return fn(*args, **kwargs)
+        except MlflowException as e:
+            if (
+                attempt == retries
+                or e.error_code not in _RETRYABLE_MLFLOW_ERROR_CODES
+            ):
+                raise
+            delay = base_delay * 2 ** attempt + random.random() * base_delay
+            time.sleep(delay)
+
+
+class _LazyMlflowClient:
+    """
+    Class attribute that creates the MlflowClient shared by all Runs the
+    first time it is accessed rather than when this module is imported.
+    This keeps ``import agentos`` from resolving the tracking store, and
+    lets a tracking URI set after import still take effect. A new client
+    is created only if the tracking URI has changed since the last one.
+    """
+
+    def __init__(self):
+        self._client = None
+        self._tracking_uri = None
+
+    def __get__(self, instance, owner) -> MlflowClient:
+        tracking_uri = get_tracking_uri()
+        if self._client is None or tracking_uri != self._tracking_uri:
+            self._client = MlflowClient(tracking_uri)
+            self._tracking_uri = tracking_uri
+        return self._client
+
+
 class Run:
     """
     Conceptually, a Run represents code execution. More specifically, a Run has
@@ -38,7 +94,15 @@ class Run:
     - ParameterSet -> MLflow artifact file
     """
 
-    _mlflow_client = MlflowClient()
+    _mlflow_client = _LazyMlflowClient()
+    # Maps the ids of runs created in this process that have not been
+    # ended yet to the tracking URI of the store each was created in. Any
+    # left at interpreter exit are marked finished, like MLflow's fluent
+    # API does for its active run.
+    _unterminated_runs = {}
+    # Shared by all runs; created on first use by log_artifact_async().
+    _artifact_executor = None
+    ARTIFACT_UPLOAD_WORKERS = 4
 
     DEFAULT_EXPERIMENT_ID = "0"
     PCS_RUN_TAG = "pcs.is_run"
@@ -46,14 +110,14 @@ class Run:
     # Run's mlflow_client. All of these take run_id as
     # first arg, and so the pass-through logic also binds
     # self._mlflow_run_id as the first arg of the calls.
-    PASS_THROUGH_FN_PREFIXES = [
+    PASS_THROUGH_FN_PREFIXES = (
         "log",
         "set_tag",
         "list_artifacts",
         "search_runs",
         "set_terminated",
         "download_artifacts",
-    ]
+    )
 
     def __init__(
         self,
@@ -76,13 +140,15 @@ class Run:
         :param experiment_id: Optional Experiment ID.
         :param existing_run_id: Optional Run ID.
         """
-        self._return_value = None
+        self._init_local_state(owns_run=not existing_run_id)
         if existing_run_id:
             assert (
                 not experiment_id
             ), "`existing_run_id` cannot be passed with `experiment_id`"
             try:
-                self._mlflow_client.get_run(existing_run_id)
+                _retry_mlflow_call(
+                    self._mlflow_client.get_run, existing_run_id
+                )
             except MlflowException as mlflow_exception:
                 print(
                     "Error: When creating an AgentOS Run using an "
@@ -97,12 +163,58 @@ class Run:
                 exp_id = experiment_id
             else:
                 exp_id = self.DEFAULT_EXPERIMENT_ID
-            new_run = self._mlflow_client.create_run(exp_id)
+            # Pass the initial tags along with create_run() so that they are
+            # recorded in the same request instead of one set_tag() each.
+            tags = context_registry.resolve_tags({self.PCS_RUN_TAG: "True"})
+            new_run = _retry_mlflow_call(
+                self._mlflow_client.create_run, exp_id, tags=tags
+            )
             self._mlflow_run_id = new_run.info.run_id
-            self.set_tag(self.PCS_RUN_TAG, "True")
-            resolved_tags = context_registry.resolve_tags()
-            for tag_k, tag_v in resolved_tags.items():
-                self.set_tag(tag_k, tag_v)
+            Run._unterminated_runs[self._mlflow_run_id] = self._tracking_uri
+
+    def _init_local_state(self, owns_run: bool) -> None:
+        # Pin the client (and so the tracking store) this Run talks to, so
+        # its reads, its writes, and ending it at exit all go to the store
+        # it was created in even if the tracking URI changes afterwards.
+        # This instance attribute shadows the class-level _LazyMlflowClient.
+        self._tracking_uri = get_tracking_uri()
+        self._mlflow_client = type(self)._mlflow_client
+        self._return_value = None
+        # Only runs created by this object are finalized when it is used as
+        # a context manager; wrapping an existing run must not terminate it.
+        self._owns_run = owns_run
+        self._terminated = False
+        self._artifacts_dir_path = None
+        self._pending_artifact_uploads = []
+        self._tmp_dir = None
+        self._cached_mlflow_run = None
+
+    @classmethod
+    def _from_mlflow_run(cls, mlflow_run) -> "Run":
+        """
+        Wraps an MLflow run that has already been fetched from the tracking
+        store, skipping the existence check (and the get_run() request it
+        costs) that ``from_existing_run_id()`` performs.
+        """
+        run = cls.__new__(cls)
+        run._init_local_state(owns_run=False)
+        run._mlflow_run_id = mlflow_run.info.run_id
+        # The fetched run (e.g. a search result, which includes its data)
+        # also seeds the cache, so reading it costs no further requests.
+        run._cached_mlflow_run = mlflow_run
+        return run
+
+    @classmethod
+    def get_by_id(cls, run_id: RunIdentifier) -> Optional["Run"]:
+        """
+        Returns the Run with id ``run_id``, or None if no such run exists
+        at the current tracking URI. Costs a single get_run() request.
+        """
+        try:
+            mlflow_run = cls._mlflow_client.get_run(run_id)
+        except MlflowException:
+            return None
+        return cls._from_mlflow_run(mlflow_run)
 
     @classmethod
     def run_exists(cls, run_id) -> bool:
@@ -112,18 +224,50 @@ class Run:
         except MlflowException:
             return False
 
+    @classmethod
+    def _search_all_mlflow_runs(
+        cls, filter_string: str = None, client: MlflowClient = None
+    ):
+        """
+        Yields all PCS runs, most recent first, fetching one page of search
+        results at a time so that callers that stop early never request the
+        remaining pages. If given, ``filter_string`` is an additional MLflow
+        search filter that is applied by the tracking store. ``client``
+        defaults to the client for the current tracking URI; a Run passes
+        its own so that it searches the store it was created in.
+        """
+        client = client or cls._mlflow_client
+        pcs_filter = f'tag.{cls.PCS_RUN_TAG} ILIKE "%"'
+        if filter_string:
+            pcs_filter = f"{pcs_filter} AND {filter_string}"
+        page_token = None
+        while True:
+            page = client.search_runs(
+                experiment_ids=[cls.DEFAULT_EXPERIMENT_ID],
+                order_by=["attribute.start_time DESC"],
+                filter_string=pcs_filter,
+                page_token=page_token,
+            )
+            yield from page
+            page_token = page.token
+            if not page_token:
+                return
+
+    @classmethod
+    def iter_all_runs(cls, filter_string: str = None):
+        """
+        Yields all PCS runs, most recent first. If given, ``filter_string``
+        is an additional MLflow search filter (e.g. on a tag) that is
+        applied by the tracking store.
+        """
+        # The search results already contain every run, so wrap them
+        # directly rather than re-fetching each one by id.
+        for mlflow_run in cls._search_all_mlflow_runs(filter_string):
+            yield Run._from_mlflow_run(mlflow_run)
+
     @classmethod
     def get_all_runs(cls):
-        mlflow_runs = cls._mlflow_client.search_runs(
-            experiment_ids=[cls.DEFAULT_EXPERIMENT_ID],
-            order_by=["attribute.start_time DESC"],
-            filter_string=f'tag.{cls.PCS_RUN_TAG} ILIKE "%"',
-        )
-        res = []
-        for mlflow_run in mlflow_runs:
-            r = Run.from_existing_run_id(mlflow_run.info.run_id)
-            res.append(r)
-        return res
+        return list(cls.iter_all_runs())
 
     @classmethod
     def from_existing_run_id(cls, run_id: RunIdentifier) -> "Run":
@@ -135,11 +279,36 @@ class Run:
 
     @property
     def _mlflow_run(self):
-        return self._mlflow_client.get_run(self._mlflow_run_id)
+        # Fetched once and reused until this object writes to the run (see
+        # __getattr__) or refresh() is called, so reading several of
+        # identifier/data/info/to_spec() costs a single get_run() request.
+        if self._cached_mlflow_run is None:
+            self._cached_mlflow_run = self._mlflow_client.get_run(
+                self._mlflow_run_id
+            )
+        return self._cached_mlflow_run
+
+    def refresh(self) -> None:
+        """
+        Discards this Run's cached copy of its MLflow run so that the next
+        access re-fetches it from the tracking store. Needed only to pick
+        up changes made to the run by other processes or objects.
+        """
+        self._cached_mlflow_run = None
+
+    def _refresh_after(self, fn):
+        def wrapper(*args, **kwargs):
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.refresh()
+
+        return wrapper
 
     @property
     def identifier(self) -> str:
-        return self._mlflow_run.info.run_id
+        # A run's id never changes, so there is no need to fetch the run.
+        return self._mlflow_run_id
 
     @property
     def data(self) -> dict:
@@ -150,13 +319,17 @@ class Run:
         return self._mlflow_run.info
 
     def __getattr__(self, attr_name):
-        prefix_matches = [
-            attr_name.startswith(x) for x in self.PASS_THROUGH_FN_PREFIXES
-        ]
-        if any(prefix_matches):
+        if attr_name.startswith(self.PASS_THROUGH_FN_PREFIXES):
             try:
                 mlflow_client_fn = getattr(self._mlflow_client, attr_name)
-                return partial(mlflow_client_fn, self._mlflow_run_id)
+                bound_fn = partial(mlflow_client_fn, self._mlflow_run_id)
+                if attr_name.startswith(("log", "set_")):
+                    # Writes make the cached MLflow run stale.
+                    bound_fn = self._refresh_after(bound_fn)
+                # Store the bound function on the instance so that later
+                # lookups of this name no longer go through __getattr__.
+                self.__dict__[attr_name] = bound_fn
+                return bound_fn
             except AttributeError as e:
                 raise AttributeError(
                     f"No attribute '{attr_name}' could be found in either "
@@ -169,40 +342,186 @@ class Run:
                 f"'{attr_name}'"
             )
 
+    def get_artifacts_dir_path(self) -> Path:
+        """
+        Returns the local directory containing this Run's artifacts. Only
+        valid for runs whose artifacts are stored on the local filesystem.
+        The result is cached since a run's artifact URI never changes.
+        """
+        if self._artifacts_dir_path is None:
+            artifact_uri = self.info.artifact_uri
+            parsed_uri = urlparse(artifact_uri)
+            assert parsed_uri.scheme == "file", (
+                f"Artifacts of run {self._mlflow_run_id} are not stored "
+                f"locally: {artifact_uri}"
+            )
+            # url2pathname() handles Windows drive letters (file:///C:/...).
+            self._artifacts_dir_path = Path(
+                url2pathname(parsed_uri.path)
+            ).absolute()
+        return self._artifacts_dir_path
+
+    def log_artifact_async(
+        self,
+        local_path: str,
+        artifact_path: str = None,
+        cleanup: Callable[[], None] = None,
+    ) -> None:
+        """
+        Like ``log_artifact()``, but performs the upload on a background
+        thread so the caller does not block on it. If provided, ``cleanup``
+        is called once the upload has finished (e.g. to remove a temporary
+        directory holding ``local_path``). Pending uploads are waited on
+        when the run ends.
+
+        Set the environment variable ``AGENTOS_SYNC_ARTIFACT_UPLOADS=True``
+        to upload synchronously instead.
+        """
+
+        def upload():
+            try:
+                self.log_artifact(local_path, artifact_path)
+            finally:
+                if cleanup:
+                    cleanup()
+
+        if os.getenv("AGENTOS_SYNC_ARTIFACT_UPLOADS", False) == "True":
+            upload()
+            return
+        if Run._artifact_executor is None:
+            Run._artifact_executor = futures.ThreadPoolExecutor(
+                max_workers=self.ARTIFACT_UPLOAD_WORKERS,
+                thread_name_prefix="agentos-artifact-upload",
+            )
+        future = Run._artifact_executor.submit(upload)
+        self._pending_artifact_uploads.append(future)
+
+    def _get_tmp_dir(self) -> Path:
+        """
+        Returns a scratch directory for staging files before they are logged
+        as artifacts. A single directory is shared for the lifetime of this
+        Run and removed when the run ends (or, failing that, at interpreter
+        exit by the TemporaryDirectory finalizer).
+        """
+        if self._tmp_dir is None:
+            self._tmp_dir = tempfile.TemporaryDirectory(prefix="agentos-run-")
+        return Path(self._tmp_dir.name)
+
+    def _cleanup_tmp_dir(self) -> None:
+        if self._tmp_dir is not None:
+            self._tmp_dir.cleanup()
+            self._tmp_dir = None
+
+    def wait_for_artifact_uploads(self) -> None:
+        """
+        Blocks until all uploads started by ``log_artifact_async()`` have
+        finished, re-raising the first error encountered, if any.
+        """
+        pending = self._pending_artifact_uploads
+        self._pending_artifact_uploads = []
+        futures.wait(pending)
+        for future in pending:
+            future.result()
+
+    def _report_artifact_upload_errors(self) -> None:
+        """
+        Like ``wait_for_artifact_uploads()``, but prints upload errors
+        instead of raising them, for use while another exception is
+        already propagating.
+        """
+        pending = self._pending_artifact_uploads
+        self._pending_artifact_uploads = []
+        futures.wait(pending)
+        for future in pending:
+            error = future.exception()
+            if error is not None:
+                print(
+                    f"Artifact upload for run {self._mlflow_run_id} "
+                    f"failed: {repr(error)}"
+                )
+
     def _get_artifact_paths(self) -> Sequence[Path]:
-        artifacts_dir = self.download_artifacts(".")
-        artifact_paths = [
-            Path(artifacts_dir) / a.path for a in self.list_artifacts()
-        ]
-        exist = [p.exists() for p in artifact_paths]
-        assert all(exist), f"Missing artifact paths: {artifact_paths}, {exist}"
-        return artifact_paths
+        self.wait_for_artifact_uploads()
+        # The artifacts live on the local filesystem, so list them with a
+        # single directory scan instead of a list_artifacts() request; every
+        # path returned comes straight from disk and so is known to exist.
+        artifacts_dir = self.get_artifacts_dir_path()
+        if not artifacts_dir.is_dir():
+            return []
+        with os.scandir(artifacts_dir) as entries:
+            return sorted(Path(entry.path) for entry in entries)
 
     def end(
         self, status: str = RunStatus.to_string(RunStatus.FINISHED)
     ) -> None:
         """
         This is copied and adapted from MLflow's fluent api mlflow.end_run
+
+        If a background artifact upload failed, the run is marked FAILED
+        and the upload's error is re-raised.
         """
-        self.set_terminated(status)
+        try:
+            self.wait_for_artifact_uploads()
+        except Exception:
+            status = RunStatus.to_string(RunStatus.FAILED)
+            raise
+        finally:
+            self._cleanup_tmp_dir()
+            self.set_terminated(status)
+            self._mark_terminated()
+
+    def _mark_terminated(self) -> None:
+        self._terminated = True
+        Run._unterminated_runs.pop(self._mlflow_run_id, None)
+
+    @classmethod
+    def _end_unterminated_runs(cls) -> None:
+        if cls._artifact_executor is not None:
+            cls._artifact_executor.shutdown(wait=True)
+        running = RunStatus.to_string(RunStatus.RUNNING)
+        finished = RunStatus.to_string(RunStatus.FINISHED)
+        # End each run in the store it was created in, which need not be
+        # the one the current tracking URI points at.
+        clients = {}
+        for run_id, tracking_uri in list(cls._unterminated_runs.items()):
+            try:
+                if tracking_uri not in clients:
+                    clients[tracking_uri] = MlflowClient(tracking_uri)
+                client = clients[tracking_uri]
+                # The run may have been ended without going through end(),
+                # e.g. by calling set_terminated() directly.
+                status = client.get_run(run_id).info.status
+                if status == running:
+                    client.set_terminated(run_id, finished)
+            except Exception as e:
+                # The tracking server may be unreachable by now; a failure
+                # here must not turn a clean exit into a traceback.
+                print(f"Could not end run {run_id} at exit: {e}")
+        cls._unterminated_runs.clear()
 
     def print_status(self, detailed: bool = False) -> None:
         if not detailed:
-            filtered_tags = {
-                k: v
-                for k, v in self.data.tags.items()
-                if not k.startswith("mlflow.")
-            }
-            print(f"\tRun {self.identifier}: {filtered_tags}")
+            self._print_mlflow_run_summary(self._mlflow_run)
         else:
             pprint.pprint(self.to_spec())
 
+    @staticmethod
+    def _print_mlflow_run_summary(mlflow_run) -> None:
+        filtered_tags = {
+            k: v
+            for k, v in mlflow_run.data.tags.items()
+            if not k.startswith("mlflow.")
+        }
+        print(f"\tRun {mlflow_run.info.run_id}: {filtered_tags}")
+
     @staticmethod
     def print_all_status() -> None:
-        runs = Run.get_all_runs()
+        # Print straight from the search results; wrapping each one in a
+        # Run would cost a get_run() request per run to read its tags.
+        mlflow_runs = Run._search_all_mlflow_runs()
         print("\nRuns:")
-        for run in runs:
-            run.print_status()
+        for mlflow_run in mlflow_runs:
+            Run._print_mlflow_run_summary(mlflow_run)
         print()
 
     @classmethod
@@ -222,8 +541,6 @@ class Run:
         include_artifacts: bool = False,
     ) -> Registry:
         if not registry:
-            from agentos.registry import InMemoryRegistry
-
             registry = InMemoryRegistry()
         registry.add_run_spec(self.to_spec())
         # If we are writing to a WebRegistry, have local artifacts, and
@@ -234,8 +551,8 @@ class Run:
             and hasattr(registry, "add_run_artifacts")
             and urlparse(self.info.artifact_uri).scheme == "file"
         ):
-            local_artifact_path = self.get_artifacts_dir_path()
-            registry.add_run_artifacts(self.identifier, local_artifact_path)
+            local_artifact_paths = self._get_artifact_paths()
+            registry.add_run_artifacts(self.identifier, local_artifact_paths)
         return registry
 
     def to_spec(self, flatten: bool = False) -> RunSpec:
@@ -245,8 +562,23 @@ class Run:
         return self
 
     def __exit__(self, type, value, traceback) -> None:
+        # Skip the terminate RPC if the run was already ended explicitly or
+        # if this object is only a view onto a run created elsewhere.
+        should_terminate = self._owns_run and not self._terminated
         if type:
-            self.set_terminated(RunStatus.to_string(RunStatus.FAILED))
-            return
-        else:
+            # An upload error must not replace the exception in flight.
+            self._report_artifact_upload_errors()
+            self._cleanup_tmp_dir()
+            if should_terminate:
+                self.set_terminated(RunStatus.to_string(RunStatus.FAILED))
+                self._mark_terminated()
+        elif should_terminate:
             self.end()
+        else:
+            try:
+                self.wait_for_artifact_uploads()
+            finally:
+                self._cleanup_tmp_dir()
+
+
+atexit.register(Run._end_unterminated_runs)
@@ -1,6 +1,6 @@
 from hashlib import sha1
 from typing import TYPE_CHECKING
-from agentos.registry import Registry
+from agentos.registry import Registry, InMemoryRegistry
 from agentos.specs import RunCommandSpec, RunCommandSpecKeys
 from agentos.identifiers import RunIdentifier, RunCommandIdentifier
 from agentos.run import Run
@@ -47,12 +47,19 @@ class RunCommand:
         self._component = component
         self._entry_point = entry_point
         self._parameter_set = parameter_set
+        # Computed on first use; see __hash__().
+        self._hash = None
 
     def __repr__(self) -> str:
         return f"<agentos.run_command.RunCommand: {self}>"
 
     def __hash__(self) -> int:
-        return int(self._sha1(), 16)
+        # A RunCommand's component, entry point, and parameter set are not
+        # changed after construction, so hash them only once. This is used
+        # by __eq__(), __str__(), and identifier.
+        if self._hash is None:
+            self._hash = int(self._sha1(), 16)
+        return self._hash
 
     def _sha1(self) -> str:
         # Not positive if this is stable across architectures.
@@ -163,8 +170,6 @@ class RunCommand:
         For details on those flags, see :py:func:agentos.Component.to_registry:
         """
         if not registry:
-            from agentos.registry import InMemoryRegistry
-
             registry = InMemoryRegistry()
         registry.add_run_command_spec(self.to_spec())
         if recurse:
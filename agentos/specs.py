@@ -68,7 +68,10 @@ class RepoSpecKeys:
 # TODO: Figure out a better type than Any for the leaf type here.
 #       Specifically, one that captures the required serializability.
 ParameterSetSpec = Mapping[str, Mapping[str, Mapping[str, Any]]]
-ParameterSetSpec.identifier_key = "identifier"
+
+
+class ParameterSetSpecKeys:
+    IDENTIFIER = "identifier"  # for flattened ParameterSetSpec
 
 
 RunCommandSpec = Mapping
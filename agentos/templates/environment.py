@@ -8,22 +8,23 @@ from dm_env import specs
 class Corridor(agentos.Environment):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        # Set after agentos.Environment.__init__(), which resets the spaces
+        # to None. Tuples of constants are built once, at compile time.
         self.length = 5
-        self.action_space = [0, 1]
-        self.observation_space = [0, 1, 2, 3, 4, 5]
+        self.action_space = (0, 1)
+        self.observation_space = (0, 1, 2, 3, 4, 5)
         self.reset()
 
     def step(self, action):
         assert action in self.action_space
+        position = self.position[0]
         if action == 0:
-            self.position = np.array(
-                [np.float32(max(self.position[0] - 1, 0))]
-            )
+            position = max(position - 1, 0)
         else:
-            self.position = np.array(
-                [np.float32(min(self.position[0] + 1, self.length))]
-            )
-        return (self.position, np.float32(-1), self.done, dict())
+            position = min(position + 1, self.length)
+        self.position = np.array([np.float32(position)])
+        done = position >= self.length
+        return (self.position, np.float32(-1), done, dict())
 
     def reset(self):
         self.position = np.array([np.float32(0)])
@@ -1,11 +1,21 @@
+import copy
 import pprint
 import yaml
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict
 
 
 AOS_CACHE_DIR = Path.home() / ".agentos_cache"
 
+# Prefer the libyaml-backed C implementations when PyYAML was built with
+# them; they are drop-in replacements for the pure-Python SafeLoader and
+# SafeDumper and are several times faster.
+SafeYamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+SafeYamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+# Full (unsafe) dumper, for serializing arbitrary Python return values.
+YamlDumper = getattr(yaml, "CDumper", yaml.Dumper)
+
 
 def generate_dummy_dev_registry(
     version_string: str = "for_tests_dummy_dev_registry",
@@ -23,28 +33,38 @@ def generate_dummy_dev_registry(
 
 def _merge_registry_dict(a, b):
     for key, val in b.items():
-        tmp = a.get(key, {})
-        tmp.update(val)
-        a[key] = tmp
+        existing = a.get(key)
+        if existing is None:
+            a[key] = dict(val)
+        else:
+            existing.update(val)
 
 
-def _handle_agent(path_prefix, rename_map):
+@lru_cache(maxsize=None)
+def _load_agent_registry(path_prefix):
     aos_root = Path(__file__).parent.parent
     agent_spec = aos_root / path_prefix / "components.yaml"
     with open(agent_spec) as file_in:
-        registry = yaml.safe_load(file_in)
+        return yaml.load(file_in, Loader=SafeYamlLoader)
+
+
+def _handle_agent(path_prefix, rename_map):
+    # The parsed file is cached across calls (e.g. for different version
+    # strings), so work on a copy of it.
+    registry = copy.deepcopy(_load_agent_registry(path_prefix))
     renamed = {}
     for component_name, spec in registry.get("components").items():
         spec["file_path"] = str(path_prefix / Path(spec["file_path"]))
         renamed[rename_map[component_name]] = spec
-        renamed_dependencies = {}
-        for attr_name, dep_name in spec.get("dependencies", {}).items():
-            renamed_dependencies[attr_name] = rename_map[dep_name]
-        spec["dependencies"] = renamed_dependencies
+        spec["dependencies"] = {
+            attr_name: rename_map[dep_name]
+            for attr_name, dep_name in spec.get("dependencies", {}).items()
+        }
     registry["components"] = renamed
-    registry["latest_refs"] = {
-        v.split("==")[0]: v.split("==")[1] for v in rename_map.values()
-    }
+    # Values look like "name==version"; split each one only once.
+    registry["latest_refs"] = dict(
+        v.split("==", 1) for v in rename_map.values()
+    )
     return registry
 
 
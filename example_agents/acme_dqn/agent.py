@@ -8,7 +8,7 @@ class AcmeDQNAgent:
     DEFAULT_ENTRY_POINT = "evaluate"
 
     def __init__(self, **kwargs):
-        self.discount = (np.float32(kwargs["discount"]),)
+        self.discount = np.float32(kwargs["discount"])
         self.agent = dqn.DQN(
             environment_spec=self.environment.get_spec(),
             network=self.network.net,
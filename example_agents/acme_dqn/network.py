@@ -2,7 +2,9 @@ import shutil
 import sonnet as snt
 import tempfile
 import tensorflow as tf
+from functools import partial
 from pathlib import Path
+from agentos.agent_run import AgentRun
 from agentos.run import Run
 
 
@@ -15,20 +17,35 @@ class TFModelSaver:
     @classmethod
     def save(cls, save_as_name: str, network: tf.Module, run=None):
         print(f"in save, network is {network}.")
+        if not run:
+            # The checkpoint would be deleted right away since there is no
+            # run to log it to, so don't bother writing it.
+            return
         dir_path = Path(tempfile.mkdtemp())
         print(
             f"{cls.__name__}: Saving model as "
             f"{dir_path / save_as_name / save_as_name}"
         )
-        checkpoint = tf.train.Checkpoint(module=network)
-        checkpoint.save(dir_path / save_as_name / save_as_name)
-        if run:
-            run.log_artifact(dir_path / save_as_name)
-        shutil.rmtree(dir_path)
+        try:
+            checkpoint = tf.train.Checkpoint(module=network)
+            checkpoint.save(dir_path / save_as_name / save_as_name)
+        except BaseException:
+            shutil.rmtree(dir_path)
+            raise
+        run.log_artifact_async(
+            dir_path / save_as_name,
+            cleanup=partial(shutil.rmtree, dir_path),
+        )
 
     @classmethod
     def restore(cls, save_as_name: str, network: tf.Module):
-        runs = Run.get_all_runs()
+        # Models are only saved by 'learn' runs, so let the tracking server
+        # filter and order the candidates instead of fetching every run.
+        runs = Run.iter_all_runs(
+            filter_string=(
+                f"tag.{AgentRun.RUN_TYPE_TAG} = '{AgentRun.LEARN_KEY}'"
+            ),
+        )
         for run in runs:
             try:
                 save_path = Path(run.download_artifacts(save_as_name))
@@ -1,10 +1,12 @@
 # Simulates a 1D corridor
 class Corridor:
+    # These never change, so they are shared by all instances.
+    length = 5
+    action_space = (0, 1)
+    observation_space = (0, 1, 2, 3, 4, 5)
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.length = 5
-        self.action_space = [0, 1]
-        self.observation_space = [0, 1, 2, 3, 4, 5]
         self.reset()
 
     def step(self, action):
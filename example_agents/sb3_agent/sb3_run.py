@@ -1,6 +1,3 @@
-import tempfile
-import shutil
-from pathlib import Path
 from stable_baselines3 import PPO
 from stable_baselines3.common.policies import BasePolicy
 from stable_baselines3.common.callbacks import BaseCallback
@@ -103,12 +100,10 @@ class SB3Run(AgentRun):
         assert (
             self.run_type == "learn"
         ), "log_model can only be called by SB3Runs of type 'learn'"
-        dir_path = Path(tempfile.mkdtemp())
-        policy.save(dir_path / name)
-        artifact_path = dir_path / name
+        artifact_path = self._get_tmp_dir() / name
+        policy.save(artifact_path)
         assert artifact_path.is_file()
-        self.log_artifact(artifact_path)
-        shutil.rmtree(dir_path)
+        self.log_artifact_async(artifact_path, cleanup=artifact_path.unlink)
 
     @classmethod
     def get_last_logged_model(cls, name: str) -> Optional[BasePolicy]:
@@ -0,0 +1,55 @@
+"""
+Checks AgentOS Python files with black and flake8 at the same time
+
+To use::
+
+  # Check all code
+  $ python scripts/check_all.py
+
+  # Only check files changed since the last commit
+  $ python scripts/check_all.py --incremental
+"""
+
+import argparse
+import os
+import sys
+from subprocess import Popen
+from subprocess import PIPE
+from subprocess import STDOUT
+
+from shared import scripts_dir
+
+parser = argparse.ArgumentParser(
+    description="Run the format check and the linter concurrently."
+)
+parser.add_argument(
+    "--incremental",
+    action="store_true",
+    help="Only check files changed since the last commit.",
+)
+args = parser.parse_args()
+
+extra_args = ["--incremental"] if args.incremental else []
+commands = [
+    [os.path.join(scripts_dir, "format_code.py"), "--check"],
+    [os.path.join(scripts_dir, "lint_code.py")],
+]
+
+# The two checks are independent, so start both before waiting on either;
+# their output is collected separately so it doesn't interleave.
+processes = [
+    Popen(
+        [sys.executable] + cmd + extra_args,
+        stdout=PIPE,
+        stderr=STDOUT,
+        encoding="utf-8",
+    )
+    for cmd in commands
+]
+returncode = 0
+for process in processes:
+    out, _ = process.communicate()
+    if out:
+        print(out, end="")
+    returncode |= process.returncode
+sys.exit(returncode)
@@ -8,46 +8,62 @@ To use::
 
   # Print files that will be formatted, but don't actually format
   $ python scripts/format_code.py --check
+
+  # Only format files changed since the last commit
+  $ python scripts/format_code.py --incremental
 """
 
-import os
+import argparse
 import sys
-from pathlib import Path
 from subprocess import run
 from subprocess import PIPE
 from subprocess import STDOUT
 
-from shared import root_dir
-from shared import traverse_tracked_files
+from shared import collect_py_paths
+
+IGNORED_FILES = frozenset(
+    {
+        "agentos/templates/agent.py",
+    }
+)
 
-returncode = 0
 
-IGNORED_FILES = [
-    "agentos/templates/agent.py",
-]
+parser = argparse.ArgumentParser(
+    description="Format AgentOS Python files with black."
+)
+parser.add_argument(
+    "--check",
+    action="store_true",
+    help="Print the files that would be formatted, but don't format them.",
+)
+parser.add_argument(
+    "--incremental",
+    action="store_true",
+    help="Only format files changed since the last commit.",
+)
+parser.add_argument(
+    "paths",
+    nargs="*",
+    help="Files to format. Defaults to all git-tracked Python files.",
+)
+args = parser.parse_args()
 
 
-def format_file(path):
-    global returncode
-    extension = os.path.splitext(path)[1]
-    if extension != ".py":
-        return
-    cmd = ["black", "--line-length=79", path]
-    if len(sys.argv) > 1 and sys.argv[1] == "--check":
+def format_files(paths):
+    cmd = ["black", "--line-length=79"]
+    if args.check:
         cmd.append("--check")
-    result = run(cmd, stdout=PIPE, stderr=STDOUT)
-    returncode = returncode | result.returncode
-    out = result.stdout.decode("utf-8")
-    if out:
-        print(path)
-        print(out)
-        print()
-
-
-if len(sys.argv) > 1:
-    for arg in sys.argv[1:]:
-        path = Path(arg).absolute()
-        format_file(path)
-else:
-    traverse_tracked_files(root_dir, format_file, IGNORED_FILES)
+    cmd.extend(paths)
+    result = run(cmd, stdout=PIPE, stderr=STDOUT, encoding="utf-8")
+    return result.returncode, result.stdout
+
+
+paths = collect_py_paths(args.paths, IGNORED_FILES, args.incremental)
+if not paths:
+    sys.exit(0)
+
+# A single black process formats every file (in parallel internally) and
+# reports which ones it changed, rather than starting one process per file.
+returncode, out = format_files(paths)
+print(out)
 sys.exit(returncode)
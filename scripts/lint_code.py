@@ -4,47 +4,120 @@ Run flake8 linter on AgentOS Python files
 To use::
 
   $ python scripts/lint_code.py
+
+  # Only lint files changed since the last commit
+  $ python scripts/lint_code.py --incremental
+
+Files that passed with the same contents and flake8 version are recorded
+in ``.lint_cache.json`` in the repo root and are not checked again.
 """
 
+import argparse
 import os
 import sys
-from pathlib import Path
+import json
+import hashlib
 from subprocess import run
 from subprocess import PIPE
 
 from shared import root_dir
-from shared import traverse_tracked_files
+from shared import collect_py_paths
 
-returncode = 0
+IGNORED_FILES = frozenset(
+    {
+        "agentos/templates/agent.py",
+        "agentos/templates/policy.py",
+        "agentos/templates/environment.py",
+        "agentos/templates/dataset.py",
+        "agentos/templates/trainer.py",
+    }
+)
+
+
+FLAKE8_ARGS = ["--max-line-length", "79"]
+CACHE_FILE = os.path.join(root_dir, ".lint_cache.json")
+
+
+def get_cache_key():
+    # Results are only reusable with the same flake8 version and options.
+    result = run(["flake8", "--version"], stdout=PIPE, encoding="utf-8")
+    version = result.stdout.strip()
+    return " ".join([version] + FLAKE8_ARGS)
+
+
+def load_clean_files(cache_key):
+    try:
+        with open(CACHE_FILE) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("key") != cache_key:
+        return {}
+    return cache.get("clean_files", {})
 
-IGNORED_FILES = [
-    "agentos/templates/agent.py",
-    "agentos/templates/policy.py",
-    "agentos/templates/environment.py",
-    "agentos/templates/dataset.py",
-    "agentos/templates/trainer.py",
-]
 
+def save_clean_files(cache_key, clean_files):
+    with open(CACHE_FILE, "w") as f:
+        json.dump({"key": cache_key, "clean_files": clean_files}, f)
+
+
+def hash_file(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def flake_files(paths):
+    # Ask for one job per CPU explicitly so a "jobs" setting in a config
+    # file can't leave flake8 checking the batch in a single process. The
+    # job count doesn't change the results, so it isn't in FLAKE8_ARGS
+    # (and thus the cache key).
+    cmd = ["flake8", f"--jobs={os.cpu_count() or 1}"] + FLAKE8_ARGS
+    cmd.extend(paths)
+    result = run(cmd, stdout=PIPE, encoding="utf-8")
+    return result.returncode, result.stdout
+
+
+parser = argparse.ArgumentParser(
+    description="Lint AgentOS Python files with flake8."
+)
+parser.add_argument(
+    "--incremental",
+    action="store_true",
+    help="Only lint files changed since the last commit.",
+)
+parser.add_argument(
+    "paths",
+    nargs="*",
+    help="Files to lint. Defaults to all git-tracked Python files.",
+)
+args = parser.parse_args()
+
+paths = collect_py_paths(args.paths, IGNORED_FILES, args.incremental)
+
+cache_key = get_cache_key()
+clean_files = load_clean_files(cache_key)
+file_hashes = {path: hash_file(path) for path in paths}
+to_check = [
+    path
+    for path, file_hash in file_hashes.items()
+    if clean_files.get(path) != file_hash
+]
+if not to_check:
+    sys.exit(0)
 
-def flake_file(path):
-    global returncode
-    extension = os.path.splitext(path)[1]
-    if extension != ".py":
-        return
-    cmd = ["flake8", "--max-line-length", "79", path]
-    result = run(cmd, stdout=PIPE)
-    returncode = returncode | result.returncode
-    out = result.stdout.decode("utf-8")
-    if out:
-        print(path)
-        print(out)
-        print()
-
-
-if len(sys.argv) > 1:
-    for arg in sys.argv[1:]:
-        path = Path(arg).absolute()
-        flake_file(path)
-else:
-    traverse_tracked_files(root_dir, flake_file, IGNORED_FILES)
+# A single flake8 process checks every file, prefixing each error with its
+# file path, rather than starting one process per file.
+returncode, out = flake_files(to_check)
+if out:
+    print(out)
+# flake8 exits with 1 when it reports errors; anything else means it failed
+# to run, and its output says nothing about which files are clean.
+if returncode in (0, 1):
+    errors = out.splitlines()
+    for path in to_check:
+        if any(error.startswith(path + ":") for error in errors):
+            clean_files.pop(path, None)
+        else:
+            clean_files[path] = file_hashes[path]
+    save_clean_files(cache_key, clean_files)
 sys.exit(returncode)
@@ -7,8 +7,9 @@ To use::
 """
 
 import os
+from functools import lru_cache
 from subprocess import run
-from subprocess import DEVNULL
+from subprocess import PIPE
 
 scripts_dir = os.path.dirname(os.path.abspath(__file__))
 root_dir = os.path.normpath(os.path.join(scripts_dir, os.pardir))
@@ -16,28 +17,86 @@ docs_dir = os.path.join(root_dir, "documentation")
 docs_build_dir = os.path.join(root_dir, "docs")
 
 
-def is_git_tracked(file_path):
-    cmd = ["git", "ls-files", "--error-unmatch", file_path]
-    result = run(cmd, stdout=DEVNULL, stderr=DEVNULL)
-    return result.returncode == 0
+@lru_cache(maxsize=None)
+def get_tracked_files():
+    """
+    Returns the absolute paths of all files tracked by git. The list comes
+    from a single ``git ls-files`` call and is cached for the lifetime of
+    the process.
+    """
+    cmd = ["git", "ls-files", "-z"]
+    result = run(cmd, stdout=PIPE, cwd=root_dir, check=True, encoding="utf-8")
+    return frozenset(
+        os.path.normpath(os.path.join(root_dir, relative_path))
+        for relative_path in result.stdout.split("\0")
+        if relative_path
+    )
 
 
-def traverse_tracked_files(path, action_fn, ignored_files=None):
-    if not is_git_tracked(path):
-        return
+def get_changed_files():
+    """
+    Returns the absolute paths of files added, copied, modified, or renamed
+    in the working tree or index relative to HEAD.
+    """
+    cmd = ["git", "diff", "--name-only", "--diff-filter=ACMR", "HEAD"]
+    result = run(cmd, stdout=PIPE, cwd=root_dir, check=True, encoding="utf-8")
+    return {
+        os.path.normpath(os.path.join(root_dir, relative_path))
+        for relative_path in result.stdout.splitlines()
+    }
 
-    if ignored_files:
-        for relative_path in ignored_files:
-            ignored_path = os.path.join(root_dir, relative_path)
-            error = f"Ignored file {ignored_path} does not exist"
-            assert os.path.isfile(ignored_path), error
-            if path == ignored_path:
-                return
 
-    if os.path.isfile(path):
-        action_fn(path)
+def iter_tracked_files(path, extensions=None, ignored_files=None):
+    """
+    Yields the paths of all git-tracked files under ``path``, skipping
+    ``ignored_files`` (paths relative to the repo root). If ``extensions``
+    is given, only files with one of those extensions are yielded.
+    """
+    ignored_paths = set()
+    for relative_path in ignored_files or ():
+        ignored_path = os.path.normpath(os.path.join(root_dir, relative_path))
+        error = f"Ignored file {ignored_path} does not exist"
+        assert os.path.isfile(ignored_path), error
+        ignored_paths.add(ignored_path)
+    if extensions is not None:
+        # str.endswith accepts a tuple of suffixes.
+        extensions = tuple(extensions)
+    path = os.path.normpath(os.path.abspath(path))
+    prefix = os.path.join(path, "")
+    for tracked_path in sorted(get_tracked_files()):
+        if tracked_path != path and not tracked_path.startswith(prefix):
+            continue
+        if tracked_path in ignored_paths:
+            continue
+        if extensions is not None and not tracked_path.endswith(extensions):
+            continue
+        # Files deleted from the working tree are still listed by git
+        # until the deletion is staged.
+        if os.path.isfile(tracked_path):
+            yield tracked_path
 
-    if os.path.isdir(path):
-        for item in os.listdir(path):
-            to_traverse = os.path.join(path, item)
-            traverse_tracked_files(to_traverse, action_fn, ignored_files)
+
+def collect_py_paths(arg_paths, ignored_files=None, incremental=False):
+    """
+    Returns the Python files a script should process: those named in
+    ``arg_paths`` (relative to the working directory), or, if none are
+    given, every git-tracked Python file except ``ignored_files``. If
+    ``incremental`` is set, only files changed since the last commit are
+    kept, whether or not they were named explicitly.
+    """
+    if arg_paths:
+        # Resolve against the working directory once, as plain strings,
+        # since the script may be handed thousands of paths (e.g. by xargs).
+        # normpath() makes them comparable with get_changed_files().
+        cwd = os.getcwd()
+        paths = [
+            os.path.normpath(os.path.join(cwd, arg))
+            for arg in arg_paths
+            if arg.endswith(".py")
+        ]
+    else:
+        paths = list(iter_tracked_files(root_dir, {".py"}, ignored_files))
+    if incremental:
+        changed_files = get_changed_files()
+        paths = [path for path in paths if path in changed_files]
+    return paths
@@ -0,0 +1,17 @@
+import pytest
+
+
+@pytest.fixture(scope="module", autouse=True)
+def mlflow_tracking_dir(tmp_path_factory):
+    """
+    Point MLflow at a fresh tracking directory for each test module, so
+    tests don't write runs into (or search through) an ``mlruns`` directory
+    in the working directory, and so that modules run in parallel don't
+    share a store.
+    """
+    # MLflow only creates the default experiment when it creates the store
+    # directory itself, so point it at a directory that doesn't exist yet.
+    tracking_dir = tmp_path_factory.mktemp("mlruns") / "store"
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("MLFLOW_TRACKING_URI", tracking_dir.as_uri())
+        yield tracking_dir
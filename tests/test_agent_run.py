@@ -0,0 +1,76 @@
+from mlflow.utils.mlflow_tags import MLFLOW_PARENT_RUN_ID, MLFLOW_RUN_NAME
+from agentos.agent_run import AgentRun
+
+
+def test_agent_run_learn_and_evaluate():
+    learn_run = AgentRun(
+        AgentRun.LEARN_KEY, agent_name="MyAgent", environment_name="MyEnv"
+    )
+    learn_run.add_episode_data(steps=3, reward=1.0)
+    learn_run.add_episode_data(steps=5, reward=4.0)
+    learn_run.add_episode_data(steps=2, reward=2.0)
+    assert learn_run.episode_data == [
+        {"steps": 3, "reward": 1.0},
+        {"steps": 5, "reward": 4.0},
+        {"steps": 2, "reward": 2.0},
+    ]
+    learn_run.end(print_results=False)
+
+    assert learn_run.data.params == {
+        AgentRun.AGENT_NAME_KEY: "MyAgent",
+        AgentRun.ENV_NAME_KEY: "MyEnv",
+    }
+    learn_tags = learn_run.data.tags
+    assert learn_tags[AgentRun.IS_AGENT_RUN_TAG] == "True"
+    assert learn_tags[AgentRun.RUN_TYPE_TAG] == AgentRun.LEARN_KEY
+    assert learn_tags[MLFLOW_RUN_NAME] == (
+        "AgentOS learn with Agent 'MyAgent' and Env 'MyEnv'"
+    )
+    assert MLFLOW_PARENT_RUN_ID not in learn_tags
+    # The learn run's own metrics are computed before they are logged, so
+    # they are not part of its training totals.
+    assert learn_run.data.metrics == {
+        "episode_count": 3,
+        "step_count": 10,
+        "max_reward": 4.0,
+        "median_reward": 2.0,
+        "mean_reward": 7.0 / 3,
+        "min_reward": 1.0,
+        "training_episode_count": 0,
+        "training_step_count": 0,
+    }
+
+    eval_run = AgentRun(AgentRun.EVALUATE_KEY, parent_run=learn_run)
+    eval_run.add_episode_data(steps=4, reward=-1.5)
+    eval_run.add_episode_data(steps=6, reward=0.5)
+    eval_run.end(print_results=False)
+
+    assert eval_run.data.params == {
+        AgentRun.AGENT_NAME_KEY: "agent",
+        AgentRun.ENV_NAME_KEY: "environment",
+    }
+    eval_tags = eval_run.data.tags
+    assert eval_tags[AgentRun.RUN_TYPE_TAG] == AgentRun.EVALUATE_KEY
+    assert eval_tags[MLFLOW_PARENT_RUN_ID] == learn_run.identifier
+    # Only the learn run counts towards the training totals.
+    assert eval_run.get_training_info() == (3, 10)
+    assert eval_run.data.metrics == {
+        "episode_count": 2,
+        "step_count": 10,
+        "max_reward": 0.5,
+        "median_reward": -0.5,
+        "mean_reward": -0.5,
+        "min_reward": -1.5,
+        "training_episode_count": 3,
+        "training_step_count": 10,
+    }
+
+
+def test_agent_run_training_info_uses_its_own_store(tmp_path, monkeypatch):
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", (tmp_path / "a").as_uri())
+    learn_run = AgentRun(AgentRun.LEARN_KEY)
+    learn_run.add_episode_data(steps=7, reward=1.0)
+    learn_run.end(print_results=False)
+    eval_run = AgentRun(AgentRun.EVALUATE_KEY)
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", (tmp_path / "b").as_uri())
+    assert eval_run.get_training_info() == (1, 7)
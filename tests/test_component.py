@@ -5,7 +5,7 @@ from unittest.mock import DEFAULT
 from agentos.component import Component
 from agentos.component_run import ComponentRun
 from agentos.run_command import RunCommand
-from utils import run_test_command, run_in_dir
+from utils import run_test_command
 from agentos.cli import init
 
 
@@ -79,23 +79,23 @@ def test_component_repl_demo():
     assert copy._mlflow_run.to_dictionary() == r._mlflow_run.to_dictionary()
 
 
-def test_component_freezing(tmpdir):
-    with run_in_dir(tmpdir):
-        run_test_command(init)
-        c = Component.from_registry_file("components.yaml", "agent")
-        with patch.multiple(
-            "agentos.repo.Repo",
-            get_version_from_git=DEFAULT,
-            get_prefixed_path_from_repo_root=DEFAULT,
-        ) as mocks:
-            mocks["get_version_from_git"].return_value = (
-                "https://example.com",
-                "test_freezing_version",
-            )
-            mocks[
-                "get_prefixed_path_from_repo_root"
-            ].return_value = "freeze/test.py"
-            reg = c.to_frozen_registry()
-            agent_spec = reg.get_component_spec("agent", flatten=True)
-            assert agent_spec["repo"] == "local_dir"
-            assert agent_spec["version"] == "test_freezing_version"
+def test_component_freezing(tmpdir, monkeypatch):
+    monkeypatch.chdir(tmpdir)
+    run_test_command(init)
+    c = Component.from_registry_file("components.yaml", "agent")
+    with patch.multiple(
+        "agentos.repo.Repo",
+        get_version_from_git=DEFAULT,
+        get_prefixed_path_from_repo_root=DEFAULT,
+    ) as mocks:
+        mocks["get_version_from_git"].return_value = (
+            "https://example.com",
+            "test_freezing_version",
+        )
+        mocks[
+            "get_prefixed_path_from_repo_root"
+        ].return_value = "freeze/test.py"
+        reg = c.to_frozen_registry()
+        agent_spec = reg.get_component_spec("agent", flatten=True)
+        assert agent_spec["repo"] == "local_dir"
+        assert agent_spec["version"] == "test_freezing_version"
@@ -13,3 +13,9 @@ def test_param_set_updates():
     assert param_set.get_component_params("1") == {"2": {"3": 5, "10": 11}}
     assert param_set.get_function_params("1", "2") == {"3": 5, "10": 11}
     assert param_set.get_param("1", "2", "3") == 5
+
+
+def test_param_set_from_empty_yaml(tmpdir):
+    empty_file = tmpdir.join("params.yaml")
+    empty_file.write("")
+    assert ParameterSet.from_yaml(str(empty_file)) == ParameterSet()
@@ -1,5 +1,7 @@
 """Test suite for AgentOS Registry."""
+import json
 import pytest
+from pathlib import Path
 from tests.utils import is_linux, RANDOM_AGENT_DIR, CHATBOT_AGENT_DIR
 from agentos.registry import Registry
 from agentos.component import Component
@@ -139,3 +141,18 @@ def test_registry_from_file():
     reg_from_component = chatbot_agent.to_registry()
     assert reg_from_component.get_component_spec("chatbot")
     assert reg_from_component.get_component_spec("env_class")
+
+
+def test_registry_yaml_round_trip(tmpdir):
+    r = Registry.from_yaml(RANDOM_AGENT_DIR / "components.yaml")
+    yaml_path = Path(tmpdir) / "registry.yaml"
+    r.to_yaml(yaml_path)
+    assert Registry.from_yaml(yaml_path).to_dict() == r.to_dict()
+
+
+def test_registry_from_json(tmpdir):
+    r = Registry.from_yaml(RANDOM_AGENT_DIR / "components.yaml")
+    json_path = Path(tmpdir) / "registry.json"
+    with open(json_path, "w") as f:
+        json.dump(r.to_dict(), f)
+    assert Registry.from_json(json_path).to_dict() == r.to_dict()
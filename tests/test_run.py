@@ -1,3 +1,6 @@
+import pytest
+
+
 # Defined in module global namespaces since components cannot be
 # created from classes that are defined inside of functions.
 class Simple:
@@ -8,6 +11,11 @@ class Simple:
         return self._x, input
 
 
+class Failing:
+    def fn(self):
+        raise ValueError("entry point failed")
+
+
 def test_component_run():
     from agentos import ParameterSet, Component
     from agentos.registry import InMemoryRegistry
@@ -50,3 +58,134 @@ def test_run_tracking():
     assert run.data.metrics["test_metric"] == 1
     run.set_tag("test_tag", "tag_val")
     assert run.data.tags["test_tag"] == "tag_val"
+
+
+def test_run_get_by_id():
+    from agentos.run import Run
+
+    run = Run()
+    fetched = Run.get_by_id(run.identifier)
+    assert fetched.identifier == run.identifier
+    assert Run.get_by_id("not-a-real-run-id") is None
+
+
+def test_get_all_runs():
+    from agentos.run import Run
+
+    run = Run()
+    all_run_ids = [r.identifier for r in Run.get_all_runs()]
+    assert run.identifier in all_run_ids
+
+
+def test_log_artifact_async(tmpdir):
+    from functools import partial
+    from pathlib import Path
+    from agentos.run import Run
+
+    artifact = Path(tmpdir) / "artifact.txt"
+    artifact.write_text("hello")
+    cleaned_up = []
+    with Run() as run:
+        run.log_artifact_async(
+            str(artifact), cleanup=partial(cleaned_up.append, True)
+        )
+    assert cleaned_up == [True]
+    assert "artifact.txt" in [a.path for a in run.list_artifacts()]
+
+
+def test_run_to_spec_after_end():
+    from agentos.run import Run
+
+    run = Run()
+    run.end()
+    assert run.to_spec() == run.to_spec()
+    run.set_tag("after_end", "yes")
+    assert run.to_spec()["data"]["tags"]["after_end"] == "yes"
+
+
+def test_component_run_resets_active_run_on_error():
+    from agentos import Component
+
+    c = Component.from_class(Failing)
+    with pytest.raises(ValueError):
+        c.run("fn")
+    assert c.active_run is None
+
+
+def test_run_caches_mlflow_run():
+    from agentos.run import Run
+
+    run = Run()
+    assert run._mlflow_run is run._mlflow_run
+    cached = run._mlflow_run
+    run.log_metric("cached_metric", 2)
+    assert run._mlflow_run is not cached
+    assert run.data.metrics["cached_metric"] == 2
+
+
+def test_run_pass_through_is_bound_once():
+    from agentos.run import Run
+
+    run = Run()
+    assert run.log_param is run.log_param
+    run.log_param("bound_param", "val")
+    assert run.data.params["bound_param"] == "val"
+
+
+def test_run_keeps_its_tracking_store(tmp_path, monkeypatch):
+    from agentos.run import Run
+
+    run = Run()
+    run.log_param("before", "1")
+    other_uri = (tmp_path / "other_store").as_uri()
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", other_uri)
+    run.log_param("after", "2")
+    assert run.data.params == {"before": "1", "after": "2"}
+    assert Run.get_by_id(run.identifier) is None
+
+
+def test_unended_runs_are_finished_in_their_own_store(tmp_path):
+    import subprocess
+    import sys
+    from mlflow.tracking import MlflowClient
+
+    store_uri = (tmp_path / "store").as_uri()
+    other_uri = (tmp_path / "other").as_uri()
+    script = (
+        "import os\n"
+        "from agentos.run import Run\n"
+        f"os.environ['MLFLOW_TRACKING_URI'] = {store_uri!r}\n"
+        "print(Run().identifier)\n"
+        f"os.environ['MLFLOW_TRACKING_URI'] = {other_uri!r}\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=tmp_path,
+        stdout=subprocess.PIPE,
+        check=True,
+        encoding="utf-8",
+    )
+    run_id = result.stdout.strip()
+    assert MlflowClient(store_uri).get_run(run_id).info.status == "FINISHED"
+    assert not (tmp_path / "mlruns").exists()
+
+
+def test_failed_artifact_upload_fails_run(tmp_path):
+    from agentos.run import Run
+
+    with pytest.raises(OSError):
+        with Run() as run:
+            run.log_artifact_async(str(tmp_path / "does_not_exist"))
+    run.refresh()
+    assert run.info.status == "FAILED"
+    assert run.identifier not in Run._unterminated_runs
+
+
+def test_iter_all_runs_with_filter():
+    from agentos.run import Run
+
+    tagged = Run()
+    tagged.set_tag("filter_test", "yes")
+    Run()
+    filtered = Run.iter_all_runs(filter_string="tag.filter_test = 'yes'")
+    assert [run.identifier for run in filtered] == [tagged.identifier]
@@ -3,6 +3,7 @@ from registry.models import Component
 from registry.models import ComponentRelease
 import requests
 import yaml
+from agentos.utils import SafeYamlLoader
 
 # {'2048':
 #    {
@@ -35,7 +36,7 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         registry_url = options["registry_url"]
         result = requests.get(registry_url)
-        registry = yaml.load(result.text, Loader=yaml.SafeLoader)
+        registry = yaml.load(result.text, Loader=SafeYamlLoader)
         for component_name, data in registry.items():
             component_type = {
                 "environment": Component.ENVIRONMENT,
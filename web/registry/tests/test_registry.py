@@ -75,6 +75,7 @@ class RegistryTestCases(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.headers["Content-Type"], "application/gzip")
+        self.assertTrue(response.streaming)
         self.assertIn("Content-Disposition", response.headers)
 
     def test_run_root_spec(self):
@@ -1,7 +1,7 @@
 import yaml
 from django.db import transaction
 from django.urls import reverse
-from django.http import HttpResponse
+from django.http import FileResponse
 from rest_framework import viewsets
 from rest_framework.permissions import AllowAny
 from rest_framework.request import Request
@@ -14,6 +14,7 @@ from .models import Component
 from .serializers import RunSerializer
 from .serializers import RepoSerializer
 from .serializers import ComponentSerializer
+from agentos.utils import SafeYamlLoader
 
 
 class ComponentViewSet(viewsets.ModelViewSet):
@@ -28,7 +29,7 @@ class ComponentViewSet(viewsets.ModelViewSet):
             raise ValidationError(f"No {SPEC_NAME} included in ingest request")
 
         raw_spec = request.data[SPEC_NAME]
-        spec_dict = yaml.safe_load(raw_spec)
+        spec_dict = yaml.load(raw_spec, Loader=SafeYamlLoader)
         repos, components = Component.ingest_spec_dict(spec_dict)
         serialized = ComponentSerializer(components, many=True)
         return Response(serialized.data)
@@ -61,7 +62,7 @@ class RunViewSet(viewsets.ModelViewSet):
 
     @transaction.atomic
     def create(self, request):
-        data = yaml.safe_load(request.data["run_data"])
+        data = yaml.load(request.data["run_data"], Loader=SafeYamlLoader)
         if Run.objects.filter(id=data["id"]).exists():
             host = request.headers.get("HOST", "")
             path = reverse("run-detail", kwargs={"pk": data["id"]})
@@ -105,8 +106,9 @@ class RunViewSet(viewsets.ModelViewSet):
         run = self.get_object()
         if not run.artifact_tarball:
             raise ValidationError(f"No files associated with Run {run.id}")
-        response = HttpResponse(
-            run.artifact_tarball.open(), content_type="application/gzip"
+        # Stream the tarball in chunks rather than reading it into memory.
+        response = FileResponse(
+            run.artifact_tarball.open("rb"), content_type="application/gzip"
         )
         disposition = f"attachment; filename={run.artifact_tarball.name}"
         response["Content-Disposition"] = disposition